@@ -0,0 +1,198 @@
+"""
+Shared rendering helpers for the FLCMS icon scripts
+
+Used by create_icon.py and generate_church_icon.py. Imported as a sibling
+module (from _iconlib import ...) because both scripts are run directly.
+"""
+
+from PIL import Image, ImageDraw, ImageFilter
+import numpy as np
+import math
+from functools import lru_cache
+
+# Pillow-SIMD tracks older Pillow releases that predate the Image.Resampling
+# and Image.Quantize enums
+LANCZOS = getattr(Image, 'Resampling', Image).LANCZOS
+BILINEAR = getattr(Image, 'Resampling', Image).BILINEAR
+FASTOCTREE = getattr(Image, 'Quantize', Image).FASTOCTREE
+
+# Icons up to this size are saved as 128-color palette PNGs. Quantizing bands
+# the gradient into 7 px steps at 128 px and 14 px at 256 px; at 64 px and
+# below the steps are 2-3 px wide and do not show.
+PALETTE_MAX_SIZE = 64
+
+WHITE = (255, 255, 255)
+
+# Background gradients are described as bands of (start, width, low, high):
+# from start outwards (as a fraction of the radius) the color blends from low
+# to high over width, and holds high beyond that. Each pixel uses the last
+# band whose start it lies past, so starts must be ascending. A band with
+# equal low and high colors is solid.
+
+@lru_cache(maxsize=8)
+def _radial_levels(size, radius):
+    """Distance from the center as 8-bit levels, see _level_distances
+    
+    Resized from Pillow's built-in 256x256 radial gradient to the disc's
+    bounding square, so the whole distance field is computed in C. Cached and
+    shared: treat as read-only.
+    """
+    # Pillow's gradient is centred on pixel 128, not 127.5. Crop the odd
+    # 255x255 square around that pixel and resize it to an odd diameter, so
+    # the center lands exactly on pixel size // 2 like the cross.
+    diameter = 2 * radius + 3
+    gradient = Image.radial_gradient('L').crop((1, 1, 256, 256))
+    gradient = gradient.resize((diameter, diameter), BILINEAR)
+    levels = Image.new('L', (size, size), 255)
+    levels.paste(gradient, (size // 2 - radius - 1, size // 2 - radius - 1))
+    levels = np.asarray(levels)
+    levels.flags.writeable = False
+    return levels
+
+def _level_distances(radius):
+    """Pixel distance from the center for each of the 256 radial levels"""
+    # Pillow's gradient reaches 255 at the corners of its square, sqrt(2) half-widths out
+    return np.arange(256, dtype=np.float32) * (math.sqrt(2) * (radius + 1.5) / 255)
+
+@lru_cache(maxsize=8)
+def _disc_mask(size, radius):
+    """True for pixels outside the disc, from the exact distance to the center
+    
+    The 8-bit levels are about 2.5 px apart at 1024 px, too coarse to place
+    the rim. Cached and shared: treat as read-only.
+    """
+    offsets = np.arange(size, dtype=np.float32) - size // 2
+    outside = np.hypot(offsets[:, None], offsets[None, :]) > radius + 0.5
+    outside.flags.writeable = False
+    return outside
+
+@lru_cache(maxsize=8)
+def _gradient_lut(radius, bands, base_alpha):
+    """RGBA color for each radial level, holding the rim color past the radius"""
+    dist = _level_distances(radius)
+    ratio = np.minimum(dist / radius, 1.0)[:, None]
+    
+    colors = None
+    for start, width, low, high in bands:
+        low = np.array(low, dtype=np.float32)
+        high = np.array(high, dtype=np.float32)
+        t = np.clip((ratio - np.float32(start)) / np.float32(width), 0.0, 1.0)
+        band = low + (high - low) * t
+        colors = band if colors is None else np.where(ratio > start, band, colors)
+    
+    lut = np.zeros((256, 4), dtype=np.uint8)
+    lut[:, :3] = colors
+    # Opacity rises from base_alpha at the center to opaque at the rim
+    lut[:, 3] = 255 * (base_alpha + (1 - base_alpha) * ratio[:, 0])
+    lut.flags.writeable = False
+    return lut
+
+def build_gradient_rgba(size, bands, base_alpha):
+    """Render the background disc as a fresh (size, size, 4) uint8 array"""
+    radius = int(size * 0.45)
+    if radius == 0:
+        # Below 3 px there is no disc to draw
+        return np.zeros((size, size, 4), dtype=np.uint8)
+    
+    # Tint Pillow's radial gradient through the lookup table, opacity included,
+    # then clear everything outside the disc
+    levels = _radial_levels(size, radius)
+    lut = _gradient_lut(radius, bands, base_alpha)
+    pixels = np.take(lut, levels, axis=0)
+    # Cleared through a 32-bit view, one word per pixel, which is several
+    # times faster than a boolean index over the four channels
+    np.copyto(pixels.view(np.uint32)[..., 0], 0, where=_disc_mask(size, radius))
+    return pixels
+
+def render_cross(pixels, shadow_offset=0):
+    """Paint the white cross into pixels, optionally over a soft drop shadow"""
+    size = pixels.shape[0]
+    center = size // 2
+    cross_size = int(size * 0.35)
+    cross_thickness = int(cross_size * 0.15)
+    
+    # Cross mask: the union of the vertical and horizontal bars
+    offsets = np.abs(np.arange(size) - center)
+    in_bar = offsets <= cross_thickness // 2
+    in_span = offsets <= cross_size // 2
+    cross = (in_span[:, None] & in_bar[None, :]) | (in_bar[:, None] & in_span[None, :])
+    
+    # Shadow: blur the mask once, then darken the gradient under a copy
+    # shifted down and to the right
+    if shadow_offset:
+        shadow = Image.fromarray(cross.astype(np.uint8) * 100)
+        shadow = np.asarray(shadow.filter(ImageFilter.GaussianBlur(shadow_offset)))
+        shade = 1 - shadow[:-shadow_offset, :-shadow_offset, None] / np.float32(255)
+        under = pixels[shadow_offset:, shadow_offset:, :3]
+        under[...] = under * shade
+    
+    pixels[cross] = WHITE + (255,)
+
+def to_image(pixels):
+    """Wrap an RGBA buffer as an Image without copying it
+    
+    frombuffer keeps a reference to pixels, and the first composite onto the
+    image makes Pillow's own writable copy.
+    """
+    pixels = np.ascontiguousarray(pixels)
+    size = pixels.shape[1], pixels.shape[0]
+    return Image.frombuffer('RGBA', size, pixels, 'raw', 'RGBA', 0, 1)
+
+# Glyph stamps are drawn once per icon_size, centred in a transparent
+# (2 * icon_size) square, and composited wherever they are needed. Stamp
+# functions should be lru_cache'd; the cached images are shared, so treat
+# them as read-only.
+
+def new_stamp(icon_size):
+    """Create an empty stamp and a draw handle for it"""
+    stamp = Image.new('RGBA', (2 * icon_size, 2 * icon_size), (0, 0, 0, 0))
+    return stamp, ImageDraw.Draw(stamp)
+
+@lru_cache(maxsize=None)
+def _directions(angles):
+    """Unit direction vectors for the given angles, computed in one vectorized step"""
+    angles = np.array(angles)
+    return np.stack([np.cos(angles), np.sin(angles)], axis=1)
+
+def render_glyphs(img, elements, distance, icon_size):
+    """Composite (angle, stamp) elements at distance from the image center"""
+    center = img.width // 2
+    directions = _directions(tuple(angle for angle, _ in elements))
+    # astype(int) truncates toward zero, matching int() on each coordinate
+    positions = (center + (directions * distance).astype(int) - icon_size).tolist()
+    for (_, stamp), position in zip(elements, positions):
+        img.alpha_composite(stamp(icon_size), tuple(position))
+
+@lru_cache(maxsize=8)
+def _cached_render(render, size):
+    """Rendered pixels by size, kept as immutable bytes so callers can't mutate the cache"""
+    icon = render(size)
+    return icon.tobytes(), icon.size
+
+def cached_icon(render, size):
+    """Return render(size) from a cache shared by both scripts, as a fresh Image"""
+    data, dims = _cached_render(render, size)
+    return Image.frombytes('RGBA', dims, data)
+
+def pyramid(icon, sizes):
+    """Yield (size, image) largest first, each level downscaled from the one above"""
+    for size in sorted(sizes, reverse=True):
+        if size != icon.width:
+            icon = icon.resize((size, size), LANCZOS)
+        yield size, icon
+
+def save_icon(filename, icon, optimize=False):
+    """Save one icon size, picking the PNG encoding by size
+    
+    optimize=True keeps full color and runs the slow multi-pass optimizer,
+    meant for the distributed master icon.
+    """
+    if optimize:
+        icon.save(filename, 'PNG', optimize=True)
+    elif icon.width <= PALETTE_MAX_SIZE:
+        # Lossy (channels move by up to ~25 levels) but the bands are too
+        # narrow to see here, and the palette PNG is a quarter to half the bytes
+        palette = icon.quantize(colors=128, method=FASTOCTREE)
+        palette.save(filename, 'PNG', optimize=True)
+    else:
+        icon.save(filename, 'PNG', compress_level=6)
\ No newline at end of file
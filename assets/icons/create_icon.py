@@ -3,102 +3,87 @@
 FLCMS Church Management App Icon Generator
 """
 
-try:
-    from PIL import Image, ImageDraw
-    import math
-    import os
-except ImportError:
-    print("Installing PIL...")
-    import subprocess
-    subprocess.check_call(['python', '-m', 'pip', 'install', 'Pillow'])
-    from PIL import Image, ImageDraw
-    import math
-    import os
+import numpy as np
+import math
+from functools import lru_cache
 
-def create_church_icon(size=1024):
-    """Create church management app icon"""
-    
-    # Create image
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Colors
-    blue = (74, 144, 226)
-    dark_blue = (46, 90, 165)
-    white = (255, 255, 255)
-    
-    # Background circle
-    center = size // 2
-    radius = int(size * 0.45)
-    
-    # Gradient effect with multiple circles
-    for i in range(radius, 0, -3):
-        ratio = i / radius
-        alpha = int(255 * (0.7 + 0.3 * ratio))
-        color = blue if ratio > 0.5 else dark_blue
-        draw.ellipse([center-i, center-i, center+i, center+i], 
-                    fill=color + (alpha,))
-    
-    # White cross
-    cross_size = int(size * 0.35)
-    cross_thickness = int(cross_size * 0.15)
-    
-    # Vertical bar
-    draw.rectangle([
-        center - cross_thickness//2,
-        center - cross_size//2,
-        center + cross_thickness//2,
-        center + cross_size//2
-    ], fill=white)
-    
-    # Horizontal bar
-    draw.rectangle([
-        center - cross_size//2,
-        center - cross_thickness//2,
-        center + cross_size//2,
-        center + cross_thickness//2
-    ], fill=white)
-    
-    # Small management icons around cross
-    icon_size = int(size * 0.05)
-    distance = int(size * 0.28)
-    
-    # Document (top-right)
-    doc_x = center + int(math.cos(-math.pi/4) * distance)
-    doc_y = center + int(math.sin(-math.pi/4) * distance)
+from _iconlib import (build_gradient_rgba, render_cross, to_image, new_stamp,
+                      render_glyphs, cached_icon, pyramid, save_icon)
+
+# Colors
+BLUE = (74, 144, 226)
+DARK_BLUE = (46, 90, 165)
+
+# Gradient bands, see _iconlib: dark blue center, solid blue past half the radius
+GRADIENT = (
+    (0.0, 1.0, DARK_BLUE, DARK_BLUE),
+    (0.5, 1.0, BLUE, BLUE),
+)
+
+@lru_cache(maxsize=None)
+def _document_stamp(icon_size):
+    """Document square"""
+    stamp, draw = new_stamp(icon_size)
+    c = icon_size
     draw.rectangle([
-        doc_x - icon_size//2, doc_y - icon_size//2,
-        doc_x + icon_size//2, doc_y + icon_size//2
+        c - icon_size//2, c - icon_size//2,
+        c + icon_size//2, c + icon_size//2
     ], fill=(255, 255, 255, 180))
+    return stamp
+
+@lru_cache(maxsize=None)
+def _people_stamp(icon_size):
+    """Three people dots in a row"""
+    stamp, draw = new_stamp(icon_size)
+    c = icon_size
+    xs = c - icon_size//2 + np.arange(3) * icon_size//3
+    boxes = np.stack([xs - icon_size//8, np.full(3, c - icon_size//8),
+                      xs + icon_size//8, np.full(3, c + icon_size//8)], axis=1)
+    for box in boxes.tolist():
+        draw.ellipse(box, fill=(255, 255, 255, 180))
+    return stamp
+
+# Small management icons around the cross, as (angle, stamp) pairs
+_ELEMENTS = (
+    (-math.pi / 4, _document_stamp),   # top-right
+    (3 * math.pi / 4, _people_stamp),  # bottom-left
+)
+
+def _render_church_icon(size):
+    """Render the icon from scratch"""
+    
+    # Background circle with gradient effect, then the white cross on top
+    pixels = build_gradient_rgba(size, GRADIENT, base_alpha=0.7)
+    render_cross(pixels)
+    img = to_image(pixels)
     
-    # People (bottom-left)
-    people_x = center + int(math.cos(3*math.pi/4) * distance)
-    people_y = center + int(math.sin(3*math.pi/4) * distance)
-    for i in range(3):
-        px = people_x - icon_size//2 + i * icon_size//3
-        draw.ellipse([
-            px - icon_size//8, people_y - icon_size//8,
-            px + icon_size//8, people_y + icon_size//8
-        ], fill=(255, 255, 255, 180))
+    # Small management icons around cross, composited from cached stamps
+    render_glyphs(img, _ELEMENTS, int(size * 0.28), int(size * 0.05))
     
     return img
 
+def create_church_icon(size=1024):
+    """Create church management app icon
+    
+    Renders are cached per size; each call returns a fresh Image.
+    """
+    return cached_icon(_render_church_icon, size)
+
 def main():
     print("Generating church management app icon...")
     
     # Generate main icon
     icon = create_church_icon(1024)
-    icon.save('app_icon.png', 'PNG')
+    save_icon('app_icon.png', icon, optimize=True)
     print("✅ Generated app_icon.png")
     
-    # Generate other sizes
-    for size in [512, 256, 128]:
-        smaller = icon.resize((size, size), Image.Resampling.LANCZOS)
-        smaller.save(f'icon_{size}.png', 'PNG')
+    # Generate other sizes as a pyramid, halving the previous level each time
+    for size, smaller in pyramid(icon, [512, 256, 128]):
+        save_icon(f'icon_{size}.png', smaller)
         print(f"✅ Generated icon_{size}.png")
     
     print("\n🎉 Church management app icons created!")
     print("📱 Main icon: app_icon.png")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
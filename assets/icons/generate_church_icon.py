@@ -4,180 +4,145 @@ FLCMS Church Management App Icon Generator
 Generates a professional church management app icon with cross and management elements
 """
 
-try:
-    from PIL import Image, ImageDraw, ImageFilter
-    import math
-    import os
-except ImportError:
-    print("Installing required dependencies...")
-    import subprocess
-    subprocess.check_call(['python', '-m', 'pip', 'install', 'Pillow'])
-    from PIL import Image, ImageDraw, ImageFilter
-    import math
-    import os
+import numpy as np
+import math
+import os
+from functools import lru_cache
 
-def create_church_management_icon(size=1024):
-    """Create a church management app icon with cross and management elements"""
-    
-    # Create image with transparent background
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Scale factor
-    scale = size / 1024
-    
-    # Define colors
-    primary_blue = (74, 144, 226)  # #4A90E2
-    secondary_blue = (53, 122, 189)  # #357ABD
-    dark_blue = (46, 90, 165)  # #2E5AA5
-    white = (255, 255, 255)
-    
-    # Background circle with gradient effect (simulate gradient with multiple circles)
-    center = size // 2
-    radius = int(size * 0.45)
-    
-    # Create gradient effect by drawing multiple circles
-    for i in range(radius, 0, -2):
-        # Interpolate color based on distance from center
-        ratio = i / radius
-        if ratio > 0.7:
-            color = primary_blue
-        elif ratio > 0.4:
-            # Interpolate between primary and secondary
-            t = (ratio - 0.4) / 0.3
-            color = tuple(int(primary_blue[j] * t + secondary_blue[j] * (1-t)) for j in range(3))
-        else:
-            # Interpolate between secondary and dark
-            t = ratio / 0.4
-            color = tuple(int(secondary_blue[j] * t + dark_blue[j] * (1-t)) for j in range(3))
-        
-        # Add slight transparency for blend effect
-        alpha = int(255 * (0.8 + 0.2 * (i / radius)))
-        draw.ellipse([center-i, center-i, center+i, center+i], 
-                    fill=color + (alpha,), outline=None)
-    
-    # Church Cross (main element)
-    cross_size = int(size * 0.35)
-    cross_thickness = int(cross_size * 0.15)
-    
-    # Add shadow effect for cross
-    shadow_offset = int(3 * scale)
-    shadow_color = (0, 0, 0, 100)
-    
-    # Shadow for vertical bar
-    draw.rectangle([
-        center - cross_thickness//2 + shadow_offset,
-        center - cross_size//2 + shadow_offset,
-        center + cross_thickness//2 + shadow_offset,
-        center + cross_size//2 + shadow_offset
-    ], fill=shadow_color)
-    
-    # Shadow for horizontal bar
-    draw.rectangle([
-        center - cross_size//2 + shadow_offset,
-        center - cross_thickness//2 + shadow_offset,
-        center + cross_size//2 + shadow_offset,
-        center + cross_thickness//2 + shadow_offset
-    ], fill=shadow_color)
-    
-    # White cross
-    # Vertical bar
-    draw.rectangle([
-        center - cross_thickness//2,
-        center - cross_size//2,
-        center + cross_thickness//2,
-        center + cross_size//2
-    ], fill=white)
-    
-    # Horizontal bar
-    draw.rectangle([
-        center - cross_size//2,
-        center - cross_thickness//2,
-        center + cross_size//2,
-        center + cross_thickness//2
-    ], fill=white)
-    
-    # Management elements around the cross
-    icon_size = int(size * 0.06)
-    element_radius = int(size * 0.32)
-    
-    # Document icon (top-right) - 45 degrees
-    doc_x = center + int(math.cos(-math.pi/4) * element_radius)
-    doc_y = center + int(math.sin(-math.pi/4) * element_radius)
+from _iconlib import (build_gradient_rgba, render_cross, to_image, new_stamp,
+                      render_glyphs, cached_icon, pyramid, save_icon)
+
+# Define colors
+PRIMARY_BLUE = (74, 144, 226)  # #4A90E2
+SECONDARY_BLUE = (53, 122, 189)  # #357ABD
+DARK_BLUE = (46, 90, 165)  # #2E5AA5
+
+# Gradient bands, see _iconlib: dark -> secondary inside 0.4 of the radius,
+# then secondary -> primary over the next 0.3
+GRADIENT = (
+    (0.0, 0.4, DARK_BLUE, SECONDARY_BLUE),
+    (0.4, 0.3, SECONDARY_BLUE, PRIMARY_BLUE),
+)
+
+# Management element stamps, drawn with _iconlib.new_stamp
+
+@lru_cache(maxsize=None)
+def _document_stamp(icon_size):
+    """Document shape with three text lines"""
+    stamp, draw = new_stamp(icon_size)
+    c = icon_size
     
     # Document shape
     draw.rectangle([
-        doc_x - icon_size//2,
-        doc_y - icon_size//2,
-        doc_x + icon_size//2,
-        doc_y + icon_size//2 + int(icon_size * 0.2)
+        c - icon_size//2,
+        c - icon_size//2,
+        c + icon_size//2,
+        c + icon_size//2 + int(icon_size * 0.2)
     ], fill=(255, 255, 255, 200))
     
     # Document lines
-    line_color = (74, 144, 226, 200)
+    line_color = PRIMARY_BLUE + (200,)
     line_height = int(icon_size * 0.08)
     for i in range(3):
         draw.rectangle([
-            doc_x - icon_size//3,
-            doc_y - icon_size//4 + i * line_height * 2,
-            doc_x + icon_size//3,
-            doc_y - icon_size//4 + i * line_height * 2 + line_height
+            c - icon_size//3,
+            c - icon_size//4 + i * line_height * 2,
+            c + icon_size//3,
+            c - icon_size//4 + i * line_height * 2 + line_height
         ], fill=line_color)
     
-    # People icon (bottom-left) - 135 degrees
-    people_x = center + int(math.cos(3*math.pi/4) * element_radius)
-    people_y = center + int(math.sin(3*math.pi/4) * element_radius)
+    return stamp
+
+@lru_cache(maxsize=None)
+def _people_stamp(icon_size):
+    """Three people circles in a row"""
+    stamp, draw = new_stamp(icon_size)
+    c = icon_size
     
-    # Three people circles
+    # Bounding boxes of all three circles, computed as one array
     circle_radius = int(icon_size * 0.12)
-    for i in range(3):
-        px = people_x - icon_size//3 + i * icon_size//3
-        py = people_y
-        draw.ellipse([
-            px - circle_radius, py - circle_radius,
-            px + circle_radius, py + circle_radius
-        ], fill=(255, 255, 255, 200))
+    xs = c - icon_size//3 + np.arange(3) * icon_size//3
+    boxes = np.stack([xs - circle_radius, np.full(3, c - circle_radius),
+                      xs + circle_radius, np.full(3, c + circle_radius)], axis=1)
+    for box in boxes.tolist():
+        draw.ellipse(box, fill=(255, 255, 255, 200))
     
-    # Calendar icon (top-left) - 225 degrees
-    cal_x = center + int(math.cos(-3*math.pi/4) * element_radius)
-    cal_y = center + int(math.sin(-3*math.pi/4) * element_radius)
+    return stamp
+
+@lru_cache(maxsize=None)
+def _calendar_stamp(icon_size):
+    """Calendar page with a 2x2 grid"""
+    stamp, draw = new_stamp(icon_size)
+    c = icon_size
     
     # Calendar base
     draw.rectangle([
-        cal_x - icon_size//2,
-        cal_y - icon_size//2,
-        cal_x + icon_size//2,
-        cal_y + icon_size//2
+        c - icon_size//2,
+        c - icon_size//2,
+        c + icon_size//2,
+        c + icon_size//2
     ], fill=(255, 255, 255, 200))
     
     # Calendar grid
+    line_color = PRIMARY_BLUE + (200,)
     grid_size = icon_size // 6
-    for i in range(2):
-        for j in range(2):
-            draw.rectangle([
-                cal_x - icon_size//4 + i * icon_size//3,
-                cal_y - icon_size//4 + j * icon_size//3,
-                cal_x - icon_size//4 + i * icon_size//3 + grid_size,
-                cal_y - icon_size//4 + j * icon_size//3 + grid_size
-            ], fill=line_color)
-    
-    # Chart icon (bottom-right) - 45 degrees
-    chart_x = center + int(math.cos(math.pi/4) * element_radius)
-    chart_y = center + int(math.sin(math.pi/4) * element_radius)
-    
-    # Chart bars
-    bar_heights = [int(icon_size*0.3), int(icon_size*0.5), int(icon_size*0.2)]
+    cells = c - icon_size//4 + np.arange(2) * icon_size//3
+    for x in cells.tolist():
+        for y in cells.tolist():
+            draw.rectangle([x, y, x + grid_size, y + grid_size], fill=line_color)
+    
+    return stamp
+
+@lru_cache(maxsize=None)
+def _chart_stamp(icon_size):
+    """Bar chart with three bars"""
+    stamp, draw = new_stamp(icon_size)
+    c = icon_size
+    
+    # Bounding boxes of all three bars, computed as one array
+    bar_heights = (icon_size * np.array([0.3, 0.5, 0.2])).astype(int)
     bar_width = icon_size // 4
-    for i, height in enumerate(bar_heights):
-        draw.rectangle([
-            chart_x - icon_size//2 + i * icon_size//3,
-            chart_y - height//2,
-            chart_x - icon_size//2 + i * icon_size//3 + bar_width,
-            chart_y + height//2
-        ], fill=(255, 255, 255, 200))
+    xs = c - icon_size//2 + np.arange(3) * icon_size//3
+    boxes = np.stack([xs, c - bar_heights//2, xs + bar_width, c + bar_heights//2], axis=1)
+    for box in boxes.tolist():
+        draw.rectangle(box, fill=(255, 255, 255, 200))
+    
+    return stamp
+
+# Management elements around the cross, as (angle, stamp) pairs
+_ELEMENTS = (
+    (-math.pi / 4, _document_stamp),      # top-right
+    (3 * math.pi / 4, _people_stamp),     # bottom-left
+    (-3 * math.pi / 4, _calendar_stamp),  # top-left
+    (math.pi / 4, _chart_stamp),          # bottom-right
+)
+
+def _render_church_management_icon(size):
+    """Render the icon from scratch"""
+    
+    # Scale factor
+    scale = size / 1024
+    
+    # Background circle with gradient effect
+    # Add slight transparency for blend effect
+    pixels = build_gradient_rgba(size, GRADIENT, base_alpha=0.8)
+    
+    # Church Cross (main element) with a shadow effect
+    render_cross(pixels, shadow_offset=int(3 * scale))
+    img = to_image(pixels)
+    
+    # Management elements around the cross, composited from cached stamps
+    render_glyphs(img, _ELEMENTS, int(size * 0.32), int(size * 0.06))
     
     return img
 
+def create_church_management_icon(size=1024):
+    """Create a church management app icon with cross and management elements
+    
+    Renders are cached per size; each call returns a fresh Image.
+    """
+    return cached_icon(_render_church_management_icon, size)
+
 def main():
     """Generate church management app icons in multiple sizes"""
     
@@ -193,17 +158,15 @@ def main():
         'icon_32.png': 32
     }
     
-    # Generate icons
+    # Render the 1024 master once and derive the smaller sizes from it as a
+    # pyramid, each level downscaled from the one above
+    master = create_church_management_icon(max(sizes.values()))
+    levels = dict(pyramid(master, sizes.values()))
+    
+    # Only the distributed icon is worth the slow multi-pass optimizer
     for filename, size in sizes.items():
-        print(f"  📱 Generating {filename} ({size}x{size})")
-        
-        # Create icon
-        icon = create_church_management_icon(size)
-        
-        # Save icon
-        icon.save(filename, 'PNG', optimize=True)
-        
-        print(f"     ✅ Saved {filename}")
+        save_icon(filename, levels[size], optimize=filename == 'app_icon.png')
+        print(f"  📱 Generated {filename} ({size}x{size})")
     
     print("\n🎉 Church management app icons generated successfully!")
     print("\n📋 Generated files:")
@@ -216,4 +179,4 @@ def main():
     print("🔧 Run 'flutter pub get && flutter pub run flutter_launcher_icons:main' to update your app icons")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file